@@ -6,53 +6,355 @@ import sys
 sys.path.append("..")
 
 import os
+import math
 import torch
+import numpy as np
 import pandas as pd
 import tqdm
 import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from safetensors.torch import load_file
 from numpy.random import default_rng
 from transformers import GPT2LMHeadModel
+from transformers.utils import SAFE_WEIGHTS_NAME, WEIGHTS_NAME
 from gpt2_no_positional_encoding_model import GPT2NoPositionalEncodingLMHeadModel
-from itertools import zip_longest
+from itertools import zip_longest, repeat
 from glob import glob
 from utils import CHECKPOINT_READ_PATH, PERTURBATIONS, PAREN_MODELS, \
     BABYLM_DATA_PATH, gpt2_hop_tokenizer, \
     marker_sg_token, marker_pl_token, compute_surprisals
 
 
+# Let the CUDA allocator grow segments instead of fragmenting as batch widths
+# change (torch>=2.1 only); this must be set before CUDA is initialized
+if torch.__version__ >= "2.1":
+    os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+
+
 MAX_TRAINING_STEPS = 3000
 CHECKPOINTS = list(range(100, MAX_TRAINING_STEPS+1, 100))
+EOS_TOKEN = gpt2_hop_tokenizer.eos_token_id
+FILE_SAMPLE_SIZE = 1000
+MAX_SEQ_LEN = 1024
+MIN_BUCKET_WIDTH = 64
+BATCH_SIZE = 32
+
+
+def load_checkpoint_weights(model, checkpoint_path, device):
+    """
+    Load the weights of a saved checkpoint into an existing model in place.
+
+    Args:
+        model: The language model, already on its target device and dtype.
+        checkpoint_path: Path to the checkpoint directory.
+        device: Device to load the weights onto.
+    """
+    weights_file = os.path.join(checkpoint_path, SAFE_WEIGHTS_NAME)
+    if os.path.isfile(weights_file):
+        # Safetensors files are memory-mapped and copied straight to the device
+        state_dict = load_file(weights_file, device=device)
+    else:
+        state_dict = torch.load(os.path.join(checkpoint_path, WEIGHTS_NAME),
+                                map_location=device)
+
+    # Tied weights (the LM head) are not saved separately
+    missing_keys, _ = model.load_state_dict(state_dict, strict=False)
+    missing_keys = set(missing_keys) - set(model._tied_weights_keys or [])
+    if len(missing_keys) > 0:
+        raise Exception(
+            f"Checkpoint '{checkpoint_path}' is missing weights: {sorted(missing_keys)}")
+
 
+def get_padded_width(length, bucket_widths=False):
+    """
+    Get the padded width of a batch whose longest row has the given length,
+    optionally rounded up to a power of two so that compiled graphs can be
+    reused across batches. Buckets start at MIN_BUCKET_WIDTH and never exceed
+    MAX_SEQ_LEN, so there are at most five of them.
+    """
+    if bucket_widths:
+        return min(max(2 ** math.ceil(math.log2(length)), MIN_BUCKET_WIDTH),
+                   MAX_SEQ_LEN)
+    return length
+
+
+def create_rotated_input_ids(seqs, target_indices, pad_token_id, width):
+    """
+    Rotate each sequence so that its target token is at the end, and stack the
+    results into a right-padded tensor.
 
-def compute_circular_surprisal(model, tokens, target_index, device):
+    Args:
+        seqs: List of token ID sequences (lists or arrays).
+        target_indices: Index of the target token in each sequence.
+        pad_token_id: Token ID used for padding.
+        width: Padded length of each row.
+
+    Returns:
+        Tuple of the padded input IDs and the length of each row.
     """
-    Compute the surprisal for the token at target_index using circular context.
+    padded_ids = torch.full((len(seqs), width), pad_token_id, dtype=torch.long)
+    for i, tokens in enumerate(seqs):
+        padded_ids[i, :len(tokens)] = torch.as_tensor(tokens)
+    lengths = torch.tensor([len(tokens) for tokens in seqs])
+
+    # Rotation as a gather: position j of a row with length L and target t
+    # reads (t + 1 + j) mod L, except the last real position, which reads t.
+    # Padded positions read themselves.
+    positions = torch.arange(width).unsqueeze(0)
+    row_lengths = lengths.unsqueeze(1)
+    row_targets = torch.tensor(target_indices).unsqueeze(1)
+    index = (row_targets + 1 + positions) % row_lengths
+    index = torch.where(positions == row_lengths - 1, row_targets, index)
+    index = torch.where(positions < row_lengths, index, positions)
+    input_ids = padded_ids.gather(1, index)
+    return input_ids, lengths
+
+
+def surprisal_bits(last_logits, target_tokens):
+    """
+    Compute the surprisal (in bits) of each row's target token from the logits
+    that predict it. With --compile, this is compiled so that it runs as a
+    single fused reduction over the vocabulary.
+
+    Args:
+        last_logits: Tensor of float32 logits with shape (batch, vocab).
+        target_tokens: Tensor of target token IDs with shape (batch,).
+
+    Returns:
+        Tensor of surprisals with shape (batch,).
+    """
+    return (torch.logsumexp(last_logits, dim=-1) -
+            last_logits.gather(-1, target_tokens[:, None]).squeeze(-1)) * (1.0 / math.log(2))
+
+
+def compute_circular_surprisal_batch(model, lm_head_weight, input_ids, lengths, device,
+                                     surprisal_fn=surprisal_bits):
+    """
+    Compute circular surprisals for a batch of rotated examples with one
+    forward pass.
 
     Args:
         model: The language model.
-        tokens: List of token IDs (ints).
-        target_index: Index of the target token.
+        lm_head_weight: Float32 copy of the LM head weight.
+        input_ids: Right-padded tensor of rotated token IDs, with the target
+            token at the end of each row.
+        lengths: Length of each row before padding.
         device: Device to run the model on.
+        surprisal_fn: Function computing surprisals from the target logits,
+            surprisal_bits or a compiled version of it.
+
+    Returns:
+        Tensor of surprisals (in bits) for the target tokens, on the device.
+    """
+    input_ids = input_ids.to(device, non_blocking=True)
+    lengths = lengths.to(device, non_blocking=True)
+    batch_range = torch.arange(len(lengths), device=device)
+    target_tokens = input_ids[batch_range, lengths - 1]
+
+    with torch.inference_mode():
+        # Rows are right-padded so that real tokens keep their position ids;
+        # padded positions come after every real token, so the causal mask
+        # hides them and no attention mask is needed.
+        # Only the hidden state at position L-2 predicts the final (target)
+        # token of each row, so apply the LM head to that position alone.
+        # Nothing is decoded afterwards, so skip building the key/value cache.
+        hidden_states = model.transformer(
+            input_ids, use_cache=False).last_hidden_state
+        # Project in float32 so that reduced-precision models don't round
+        # the logits before the reduction over the vocabulary.
+        last_logits = torch.nn.functional.linear(
+            hidden_states[batch_range, lengths - 2].float(), lm_head_weight)
+        surprisals = surprisal_fn(last_logits, target_tokens)
+    return surprisals
+
+
+def compute_marker_pair_surprisals(model, lm_head_weight,
+                                   marker_input_ids, marker_lengths,
+                                   nomarker_input_ids, nomarker_lengths, device,
+                                   surprisal_fn=surprisal_bits):
+    """
+    Compute circular surprisals for marker and no-marker versions of a batch
+    of examples with a single forward pass.
+
+    Args:
+        model: The language model.
+        lm_head_weight: Float32 copy of the LM head weight.
+        marker_input_ids: Rotated, padded token IDs containing the marker.
+        marker_lengths: Length of each marker row before padding.
+        nomarker_input_ids: Rotated token IDs with the marker removed, padded
+            to the same width as marker_input_ids.
+        nomarker_lengths: Length of each no-marker row before padding.
+        device: Device to run the model on.
+        surprisal_fn: Function computing surprisals from the target logits,
+            surprisal_bits or a compiled version of it.
+
+    Returns:
+        Tuple of tensors with marker and no-marker surprisals (in bits), on
+        the device.
+    """
+    # The rotated marker and no-marker sequences start with different tokens,
+    # so no prefix can be shared; run both halves as one batch instead.
+    input_ids = torch.cat((marker_input_ids.to(device, non_blocking=True),
+                           nomarker_input_ids.to(device, non_blocking=True)))
+    lengths = torch.cat((marker_lengths.to(device, non_blocking=True),
+                         nomarker_lengths.to(device, non_blocking=True)))
+    surprisals = compute_circular_surprisal_batch(
+        model, lm_head_weight, input_ids, lengths, device, surprisal_fn)
+    return surprisals[:len(marker_lengths)], surprisals[len(marker_lengths):]
+
+
+def create_pinned_batches(marker_input_ids, marker_lengths,
+                          nomarker_input_ids, nomarker_lengths, bucket_widths=False):
+    """
+    Split length-sorted inputs into batches, each trimmed to its own longest
+    row and stored as contiguous tensors in pinned host memory, so that
+    non-blocking copies to the device stay asynchronous.
+
+    Args:
+        marker_input_ids: Rotated, padded token IDs containing the marker.
+        marker_lengths: Length of each marker row before padding.
+        nomarker_input_ids: Rotated, padded token IDs with the marker removed.
+        nomarker_lengths: Length of each no-marker row before padding.
+        bucket_widths: Whether to pad batches to power-of-two widths.
+
+    Returns:
+        List of (marker_input_ids, marker_lengths, nomarker_input_ids,
+        nomarker_lengths) tuples, one per batch.
+    """
+    batches = []
+    for i in range(0, len(marker_lengths), BATCH_SIZE):
+        # Marker rows are one token longer than their no-marker counterparts
+        width = get_padded_width(
+            int(marker_lengths[i:i+BATCH_SIZE].max()), bucket_widths)
+        batches.append((
+            marker_input_ids[i:i+BATCH_SIZE, :width].contiguous().pin_memory(),
+            marker_lengths[i:i+BATCH_SIZE].pin_memory(),
+            nomarker_input_ids[i:i+BATCH_SIZE, :width].contiguous().pin_memory(),
+            nomarker_lengths[i:i+BATCH_SIZE].pin_memory(),
+        ))
+    return batches
+
+
+def process_test_file(test_file, seed, validate=False):
+    """
+    Sample sequences from a perturbed test file and locate their markers.
+
+    Args:
+        test_file: Path to a file of space-separated token IDs.
+        seed: Seed (or SeedSequence) for sampling from this file.
+        validate: Whether to check that the no-marker sequences were built
+            correctly.
 
     Returns:
-        The surprisal (in bits) for the target token.
+        Tuple of the sampled marker sequences (as arrays of token IDs), the
+        same sequences with the marker removed, and the index of the marker
+        in each sequence.
     """
-    # Rotate the tokens so that the target token is at the end.
-    rotated_tokens = tokens[target_index + 1:] + tokens[:target_index] + [tokens[target_index]]
+    # Get tokens from test file (+ eos token), and subsample
+    with open(test_file, 'r') as f:
+        file_token_sequences = [
+            toks for toks in (np.append(np.fromstring(l, dtype=np.int64, sep=" "), EOS_TOKEN)
+                              for l in f)
+            if len(toks) < MAX_SEQ_LEN]
+    sample_indices = default_rng(seed).choice(
+        len(file_token_sequences), size=FILE_SAMPLE_SIZE, replace=False)
+    file_token_sequences = [file_token_sequences[i]
+                            for i in sample_indices]
+
+    file_target_indices = []
+    file_nomarker_token_sequences = []
+    for tokens in file_token_sequences:
+        # Find index of first marker token for surprisal target
+        marker_mask = (tokens == marker_sg_token) | (tokens == marker_pl_token)
+        assert (marker_mask.any())
+        target_index = int(marker_mask.argmax())
+
+        # Make a version of tokens with marker removed at surprisal target
+        nomarker_tokens = np.concatenate(
+            (tokens[:target_index], tokens[target_index+1:]))
+        if validate:
+            assert (np.array_equal(tokens[:target_index], nomarker_tokens[:target_index]))
+            assert (tokens[target_index] in (marker_sg_token, marker_pl_token))
+            assert (tokens[target_index+1] == nomarker_tokens[target_index])
+
+        file_target_indices.append(target_index)
+        file_nomarker_token_sequences.append(nomarker_tokens)
+
+    return file_token_sequences, file_nomarker_token_sequences, file_target_indices
 
-    # Convert to tensor and add batch dimension.
-    input_ids = torch.tensor(rotated_tokens).unsqueeze(0).to(device)
 
-    with torch.no_grad():
-        outputs = model(input_ids)
-        # For left-to-right models, predictions are for positions 1..L.
-        logits = outputs.logits[0, :-1]
-        # Compute log probabilities.
-        log_probs = torch.log2(torch.nn.functional.softmax(logits, dim=-1))
-        # The target token is the last one in the rotated sequence.
-        target_token = rotated_tokens[-1]
-        surprisal = -log_probs[-1, target_token].item()
-    return surprisal
+def compute_checkpoint_surprisals(rank, checkpoint_shards, args, model_path,
+                                  marker_input_ids, marker_lengths,
+                                  nomarker_input_ids, nomarker_lengths, results_dir):
+    """
+    Compute marker and no-marker surprisals for one GPU's shard of checkpoints,
+    saving each checkpoint's results to results_dir/ckpt_{ckpt}.npz.
+
+    Args:
+        rank: Index of the GPU, and of its shard in checkpoint_shards.
+        checkpoint_shards: List of checkpoint lists, one per GPU.
+        args: Parsed command line arguments.
+        model_path: Path prefix of the checkpoint directories.
+        marker_input_ids: Rotated, padded token IDs containing the marker.
+        marker_lengths: Length of each marker row before padding.
+        nomarker_input_ids: Rotated, padded token IDs with the marker removed.
+        nomarker_lengths: Length of each no-marker row before padding.
+        results_dir: Directory to save the per-checkpoint results to.
+    """
+    checkpoints = checkpoint_shards[rank]
+    device = f"cuda:{rank}"
+    torch.cuda.set_device(rank)
+    dtype = torch.float32 if args.full_precision else torch.bfloat16
+
+    # Pin inputs in this process for async copies
+    batches = create_pinned_batches(
+        marker_input_ids, marker_lengths, nomarker_input_ids, nomarker_lengths,
+        bucket_widths=args.compile)
+
+    # Load model from the first checkpoint; later checkpoints are loaded into
+    # the same model in place
+    if args.no_pos_encodings:
+        model = GPT2NoPositionalEncodingLMHeadModel.from_pretrained(
+            model_path + str(checkpoints[0]), torch_dtype=dtype).to(device)
+    else:
+        model = GPT2LMHeadModel.from_pretrained(
+            model_path + str(checkpoints[0]), torch_dtype=dtype).to(device)
+    model.eval()
+
+    # Compile the transformer's forward in place, which keeps the state dict
+    # keys (and so in-place checkpoint loading) unchanged. Weights are copied
+    # into the same buffers, so the compiled graphs stay valid across
+    # checkpoints. The surprisal reduction is compiled alongside it.
+    surprisal_fn = surprisal_bits
+    if args.compile:
+        model.transformer.forward = torch.compile(
+            model.transformer.forward, mode="reduce-overhead")
+        surprisal_fn = torch.compile(surprisal_bits)
+
+    for ckpt in checkpoints:
+        print(f"Checkpoint: {ckpt}")
+        if ckpt != checkpoints[0]:
+            load_checkpoint_weights(model, model_path + str(ckpt), device)
+
+        # Float32 copy of the (tied) LM head weight for scoring
+        lm_head_weight = model.lm_head.weight.detach().float()
+
+        # Init lists for tracking correct/wrong surprisals for each batch;
+        # surprisals stay on the device until the checkpoint is done
+        marker_token_surprisals = []
+        nomarker_token_surprisals = []
+
+        # Compute circular surprisals in batches
+        for batch in tqdm.tqdm(batches, position=rank):
+            marker_surps, nomarker_surps = compute_marker_pair_surprisals(
+                model, lm_head_weight, *batch, device, surprisal_fn)
+            marker_token_surprisals.append(marker_surps)
+            nomarker_token_surprisals.append(nomarker_surps)
+
+        np.savez(os.path.join(results_dir, f"ckpt_{ckpt}.npz"),
+                 marker=torch.cat(marker_token_surprisals).cpu().numpy(),
+                 nomarker=torch.cat(nomarker_token_surprisals).cpu().numpy())
 
 
 if __name__ == "__main__":
@@ -81,6 +383,14 @@ if __name__ == "__main__":
                         help='Parenthesis model')
     parser.add_argument('-np', '--no_pos_encodings', action='store_true',
                         help="Train GPT-2 with no positional encodings")
+    parser.add_argument('-fp32', '--full_precision', action='store_true',
+                        help="Run inference in float32 instead of bfloat16")
+    parser.add_argument('-c', '--compile', action='store_true',
+                        help="Compile the model with torch.compile")
+    parser.add_argument('--include_sentences', action='store_true',
+                        help="Include decoded sentences in the results CSV")
+    parser.add_argument('--validate', action='store_true',
+                        help="Sanity check the no-marker sequences while sampling")
 
     # Get args
     args = parser.parse_args()
@@ -98,10 +408,9 @@ if __name__ == "__main__":
     test_files = sorted(glob(BABYLM_DATA_PATH +
         "/babylm_data_perturbed/babylm_{}/babylm_test_affected/*".format(args.perturbation_type)))
 
-    EOS_TOKEN = gpt2_hop_tokenizer.eos_token_id
-    FILE_SAMPLE_SIZE = 1000
-    MAX_SEQ_LEN = 1024
-    rng = default_rng(args.random_seed)
+    # Give each file its own independent, reproducible random stream so that
+    # files can be processed in parallel
+    file_seeds = np.random.SeedSequence(args.random_seed).spawn(len(test_files))
 
     marker_token_sequences = []
     nomarker_token_sequences = []
@@ -109,90 +418,61 @@ if __name__ == "__main__":
 
     # Iterate over data files to get surprisal data
     print("Sampling BabyLM affected test files to extract surprisals...")
-    for test_file in test_files:
-        print(test_file)
-
-        # Get tokens from test file (+ eos token), and subsample
-        f = open(test_file, 'r')
-        file_token_sequences = [
-            [int(s) for s in l.split()] + [EOS_TOKEN] for l in f.readlines()]
-        file_token_sequences = [
-            toks for toks in file_token_sequences if len(toks) < MAX_SEQ_LEN]
-        sample_indices = rng.choice(
-            list(range(len(file_token_sequences))), FILE_SAMPLE_SIZE, replace=False)
-        file_token_sequences = [file_token_sequences[i]
-                                for i in sample_indices]
-
-        file_target_indices = []
-        file_nomarker_token_sequences = []
-        for tokens in file_token_sequences:
-            # Find index of first marker token for surprisal target
-            target_index = None
-            for idx in range(len(tokens)):
-                if tokens[idx] in (marker_sg_token, marker_pl_token):
-                    target_index = idx
-                    break
-            assert (target_index is not None)
-
-            # Make a version of tokens with marker removed at surprisal target
-            nomarker_tokens = tokens.copy()
-            nomarker_tokens.pop(target_index)
-            assert (tokens[:target_index] == nomarker_tokens[:target_index])
-            assert (tokens[target_index] in (marker_sg_token, marker_pl_token))
-            assert (tokens[target_index+1] == nomarker_tokens[target_index])
-
-            file_target_indices.append(target_index)
-            file_nomarker_token_sequences.append(nomarker_tokens)
-
-        marker_token_sequences.extend(file_token_sequences)
-        nomarker_token_sequences.extend(file_nomarker_token_sequences)
-        target_indices.extend(file_target_indices)
-
-    # For logging/debugging, include decoded sentence
-    marker_sents = [gpt2_hop_tokenizer.decode(
-        toks) for toks in marker_token_sequences]
-    nomarker_sents = [gpt2_hop_tokenizer.decode(
-        toks) for toks in nomarker_token_sequences]
-
-    surprisal_df = pd.DataFrame({
-        "Sentences with Marker": marker_sents,
-        "Sentences without Marker": nomarker_sents,
-    })
-
-    BATCH_SIZE = 32
-    device = "cuda"
-    for ckpt in CHECKPOINTS:
-        print(f"Checkpoint: {ckpt}")
-
-        # Load model
-        if args.no_pos_encodings:
-            model = GPT2NoPositionalEncodingLMHeadModel.from_pretrained(
-                model_path + str(ckpt)).to(device)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        file_results = executor.map(process_test_file, test_files, file_seeds,
+                                    repeat(args.validate))
+        for test_file, file_result in zip(test_files, file_results):
+            print(test_file)
+            marker_token_sequences.extend(file_result[0])
+            nomarker_token_sequences.extend(file_result[1])
+            target_indices.extend(file_result[2])
+
+    # Collect columns and build the DataFrame once, after all checkpoints
+    surprisal_columns = {}
+
+    # For logging/debugging, optionally include decoded sentence
+    if args.include_sentences:
+        surprisal_columns["Sentences with Marker"] = [
+            gpt2_hop_tokenizer.decode(toks) for toks in marker_token_sequences]
+        surprisal_columns["Sentences without Marker"] = [
+            gpt2_hop_tokenizer.decode(toks) for toks in nomarker_token_sequences]
+
+    # Sort examples by length so that each batch needs little padding
+    order = np.argsort([len(toks) for toks in marker_token_sequences], kind="stable")
+    inverse_order = np.argsort(order)
+    sorted_target_indices = [target_indices[i] for i in order]
+
+    # Rotate and pad every sequence once
+    width = get_padded_width(
+        max(len(toks) for toks in marker_token_sequences), args.compile)
+    marker_input_ids, marker_lengths = create_rotated_input_ids(
+        [marker_token_sequences[i] for i in order],
+        sorted_target_indices, EOS_TOKEN, width)
+    nomarker_input_ids, nomarker_lengths = create_rotated_input_ids(
+        [nomarker_token_sequences[i] for i in order],
+        sorted_target_indices, EOS_TOKEN, width)
+
+    # Split checkpoints across the available GPUs, with one process per GPU
+    num_gpus = max(1, min(torch.cuda.device_count(), len(CHECKPOINTS)))
+    checkpoint_shards = [CHECKPOINTS[i::num_gpus] for i in range(num_gpus)]
+
+    with tempfile.TemporaryDirectory() as results_dir:
+        worker_args = (checkpoint_shards, args, model_path,
+                       marker_input_ids, marker_lengths,
+                       nomarker_input_ids, nomarker_lengths, results_dir)
+        if num_gpus > 1:
+            torch.multiprocessing.spawn(
+                compute_checkpoint_surprisals, args=worker_args, nprocs=num_gpus)
         else:
-            model = GPT2LMHeadModel.from_pretrained(
-                model_path + str(ckpt)).to(device)
-
-        # Init lists for tracking correct/wrong surprisals for each example
-        marker_token_surprisals = []
-        nomarker_token_surprisals = []
+            compute_checkpoint_surprisals(0, *worker_args)
 
-        # Compute circular surprisal for each example
-        for marker_seq, nomarker_seq, target_idx in tqdm.tqdm(zip(marker_token_sequences,
-                                                                  nomarker_token_sequences,
-                                                                  target_indices),
-                                                              total=len(marker_token_sequences)):
-            marker_surp = compute_circular_surprisal(model, marker_seq, target_idx, device)
-            nomarker_surp = compute_circular_surprisal(model, nomarker_seq, target_idx, device)
-            marker_token_surprisals.append(marker_surp)
-            nomarker_token_surprisals.append(nomarker_surp)
-
-        # Add surprisals to df
-        ckpt_df = pd.DataFrame(
-            list(zip(marker_token_surprisals, nomarker_token_surprisals)),
-            columns=[f'Marker Token Surprisals (ckpt {ckpt})',
-                     f'No Marker Token Surprisals (ckpt {ckpt})']
-        )
-        surprisal_df = pd.concat((surprisal_df, ckpt_df), axis=1)
+        # Add surprisals to columns, in the original example order
+        for ckpt in CHECKPOINTS:
+            ckpt_results = np.load(os.path.join(results_dir, f"ckpt_{ckpt}.npz"))
+            surprisal_columns[f'Marker Token Surprisals (ckpt {ckpt})'] = \
+                ckpt_results["marker"][inverse_order]
+            surprisal_columns[f'No Marker Token Surprisals (ckpt {ckpt})'] = \
+                ckpt_results["nomarker"][inverse_order]
 
     # Write results to CSV
     directory = f"hop_surprisal_results/{args.perturbation_type}_{args.train_set}{no_pos_encodings_underscore}"
@@ -200,4 +480,5 @@ if __name__ == "__main__":
         os.makedirs(directory)
     file = directory + f"/{args.paren_model}_seed{args.random_seed}.csv"
     print(f"Writing results to CSV: {file}")
+    surprisal_df = pd.DataFrame(surprisal_columns)
     surprisal_df.to_csv(file)